@@ -8,58 +8,148 @@ Convert any MP4 video into ASCII art (terminal or saved video)
 import cv2
 import numpy as np
 from PIL import Image, ImageFont, ImageDraw
-import tkinter as tk
-from tkinter import filedialog, messagebox
 import subprocess
 import shutil
+import tempfile
+import functools
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 import os
 import sys
 import time
 import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import argparse
 
 # --- ASCII set (dark → light) ---
 ASCII_CHARS = ".:-=+*#%@/\\|"
 
-def get_char_for_gray(val, chars=ASCII_CHARS):
-    idx = int((val / 255) * (len(chars) - 1))
-    return chars[idx]
+def build_index_lut(n):
+    """Return a 256-entry uint8 table mapping a gray value to an index in [0, n)."""
+    return np.array([min(n - 1, i * n // 256) for i in range(256)], dtype=np.uint8)
 
-def frame_to_ascii_lines(frame_gray, cols=120, scale=0.43, chars=ASCII_CHARS):
-    h, w = frame_gray.shape
+# Precomputed once at import for the default character set
+INDEX_LUT = build_index_lut(len(ASCII_CHARS))
+
+def resize_gray(frame, cols=120, scale=0.43, gray_buf=None):
+    """Downscale a BGR or gray frame to one gray pixel per output character.
+
+    BGR frames are converted to gray first, into `gray_buf` when its shape
+    fits so the full-resolution buffer is reused across frames.
+    """
+    if frame.ndim == 3:
+        if gray_buf is not None and gray_buf.shape != frame.shape[:2]:
+            gray_buf = None
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray_buf)
+    h, w = frame.shape
     new_w = cols
     tile_w = w / new_w
     tile_h = tile_w / scale
     new_h = max(1, int(h / tile_h))
-    small = cv2.resize(frame_gray, (new_w, new_h), interpolation=cv2.INTER_AREA)
-    return ["".join(get_char_for_gray(small[r, c], chars) for c in range(new_w)) for r in range(new_h)]
-
-def render_ascii_to_image(lines, font, bg=(0, 0, 0), fg=(255, 255, 255), padding=6):
-    """Render ASCII lines to a Pillow image for saving as video frames.
-
-    This function computes a fixed image size based on the font metrics and the
-    number of columns/rows in `lines`. It ensures the output dimensions are even
-    (many video encoders require this) and that every frame will have the same
-    size so the OpenCV VideoWriter won't fail when writing frames.
+    # For big downscales (e.g. 4K -> 120 cols) halve with the SIMD pyrDown
+    # first so the final INTER_AREA pass only touches a few pixels per cell
+    while w >= new_w * 4:
+        frame = cv2.pyrDown(frame)
+        h, w = frame.shape
+    return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+def gray_to_ascii_indices(small, lut=INDEX_LUT, out=None):
+    """Map a resized gray frame to glyph indices, writing into `out` when it fits."""
+    if out is None or out.shape != small.shape:
+        out = np.empty(small.shape, dtype=np.uint8)
+    return np.take(lut, small, out=out)
+
+@functools.lru_cache(maxsize=16)
+def build_char_lut(chars=ASCII_CHARS):
+    """Return a read-only 256-entry uint8 table mapping a gray value to an ASCII byte.
+
+    Uses the same buckets as build_index_lut, i.e. (gray * n) >> 8.
+    """
+    lut = np.frombuffer(chars.encode("ascii"), dtype=np.uint8)[build_index_lut(len(chars))]
+    lut.setflags(write=False)
+    return lut
+
+def ascii_rows_into(small, out, chars=ASCII_CHARS):
+    """Fill `out`, a (rows, cols + 1) uint8 array, with glyph bytes and a newline column."""
+    new_w = small.shape[1]
+    # cv2.LUT maps gray -> byte in one SIMD pass and writes straight into the
+    # row-strided view of `out`, so no temporaries are allocated per frame
+    cv2.LUT(small, build_char_lut(chars), dst=out[:, :new_w])
+    out[:, new_w] = ord("\n")
+    return out
+
+def frame_to_ascii_bytes(frame, cols=120, scale=0.43, chars=ASCII_CHARS, gray_buf=None):
+    """Return an ASCII frame (BGR or gray input) as bytes, each row newline-terminated."""
+    small = resize_gray(frame, cols=cols, scale=scale, gray_buf=gray_buf)
+    out = np.empty((small.shape[0], small.shape[1] + 1), dtype=np.uint8)
+    return ascii_rows_into(small, out, chars).tobytes()
+
+def frame_to_ascii_lines(frame, cols=120, scale=0.43, chars=ASCII_CHARS):
+    return frame_to_ascii_bytes(frame, cols, scale, chars).decode("ascii").splitlines()
+
+def build_glyph_atlas(font, chars=ASCII_CHARS, bg=(0, 0, 0), fg=(255, 255, 255)):
+    """Rasterize every character once into a (len(chars), char_h, char_w, 3) BGR array.
+
+    Tiles are indexed like INDEX_LUT so a frame can be composited by gathering
+    tiles with the per-pixel character index instead of laying out text.
     """
-    # Create a temporary draw to measure text metrics
     tmp = Image.new("RGB", (1, 1))
     draw = ImageDraw.Draw(tmp)
 
-    # Determine character width/height using a typical character
-    # Use 'M' since it's usually among the widest glyphs for monospace
-    bbox = draw.textbbox((0, 0), "M", font=font)
-    char_w = bbox[2] - bbox[0]
-    char_h = bbox[3] - bbox[1]
+    # Size tiles from the union of every glyph's box ('M' included as the
+    # typical monospace cell) so tall glyphs like '|' and '@' are not clipped
+    boxes = [draw.textbbox((0, 0), ch, font=font) for ch in "M" + chars]
+    left = min(b[0] for b in boxes)
+    top = min(b[1] for b in boxes)
+    char_w = max(b[2] for b in boxes) - left
+    char_h = max(b[3] for b in boxes) - top
     if char_w <= 0:
         char_w = 8
     if char_h <= 0:
         char_h = 16
 
-    # Number of columns is length of the longest line (should be constant)
-    max_cols = max((len(line) for line in lines), default=1)
-    rows = max(1, len(lines))
+    tiles = []
+    for ch in chars:
+        tile = Image.new("RGB", (char_w, char_h), color=bg)
+        ImageDraw.Draw(tile).text((-left, -top), ch, font=font, fill=fg)
+        tiles.append(np.array(tile)[:, :, ::-1])
+    return np.ascontiguousarray(np.stack(tiles))
+
+# Monospace fonts tried in order; Pillow's default font is used if none exist
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "C:\\Windows\\Fonts\\consola.ttf",
+    "C:\\Windows\\Fonts\\lucon.ttf"
+]
+
+def find_font_path():
+    """Return the first installed font from FONT_CANDIDATES, or None."""
+    for p in FONT_CANDIDATES:
+        if os.path.exists(p):
+            return p
+    return None
+
+@functools.lru_cache(maxsize=16)
+def load_glyph_atlas(font_path, font_size, chars=ASCII_CHARS, bg=(0, 0, 0), fg=(255, 255, 255)):
+    """Load a font and build its glyph atlas, cached across conversions.
 
-    img_w = char_w * max_cols + padding * 2
+    Falls back to Pillow's default font when `font_path` is None. The
+    returned atlas is shared between callers and therefore read-only.
+    """
+    font = ImageFont.truetype(font_path, font_size) if font_path else ImageFont.load_default()
+    atlas = build_glyph_atlas(font, chars, bg, fg)
+    atlas.setflags(write=False)
+    return atlas
+
+def ascii_image_size(rows, cols, atlas, padding=6):
+    """Return the (img_w, img_h) of a rendered frame, rounded up to even sizes."""
+    char_h, char_w = atlas.shape[1:3]
+
+    img_w = char_w * cols + padding * 2
     img_h = char_h * rows + padding * 2
 
     # Make dimensions even (required by most encoders)
@@ -67,16 +157,80 @@ def render_ascii_to_image(lines, font, bg=(0, 0, 0), fg=(255, 255, 255), padding
         img_w += 1
     if img_h % 2 != 0:
         img_h += 1
+    return img_w, img_h
+
+def new_ascii_canvas(rows, cols, atlas, bg=(0, 0, 0), padding=6):
+    """Allocate a BGR canvas for `render_ascii_to_image_bgr` with its border painted."""
+    char_h, char_w = atlas.shape[1:3]
+    img_w, img_h = ascii_image_size(rows, cols, atlas, padding)
+    canvas = np.empty((img_h, img_w, 3), dtype=np.uint8)
+    # Only the border around the text area needs a background fill;
+    # the interior is fully overwritten by every render.
+    bg_bgr = bg[::-1]
+    canvas[:padding] = bg_bgr
+    canvas[padding + rows * char_h:] = bg_bgr
+    canvas[:, :padding] = bg_bgr
+    canvas[:, padding + cols * char_w:] = bg_bgr
+    return canvas
+
+def atlas_glyph_rows(atlas):
+    """Re-lay an atlas as (char_h, n) glyph rows, each an opaque (char_w * 3)-byte item."""
+    char_h, char_w = atlas.shape[1:3]
+    glyph_row = np.dtype((np.void, char_w * 3))
+    return np.ascontiguousarray(atlas.swapaxes(0, 1)).reshape(char_h, -1).view(glyph_row)
+
+@functools.lru_cache(maxsize=16)
+def make_glyph_blitter(rows, cols, char_h, char_w, padding):
+    """Return a `blit(idx, rows_by_glyph, out)` specialized for one frame geometry.
+
+    The geometry is fixed for a whole run, so the text-area bounds and view
+    shapes are worked out once per shape here. `rows_by_glyph` comes from
+    `atlas_glyph_rows`, so the whole frame is a single np.take of complete
+    glyph rows into per-thread scratch followed by one copy into the canvas.
+    """
+    glyph_row = np.dtype((np.void, char_w * 3))
+    y0, y1 = padding, padding + rows * char_h
+    x0, x1 = padding, padding + cols * char_w
+    local = threading.local()
+
+    def blit(idx, rows_by_glyph, out):
+        # np.take buffers whenever `out` is non-contiguous or the indices are
+        # not intp, so gather into contiguous per-thread scratch instead
+        scratch = getattr(local, "scratch", None)
+        if scratch is None:
+            scratch = local.scratch = (np.empty((rows, cols), dtype=np.intp),
+                                       np.empty((char_h, rows, cols), dtype=glyph_row))
+        idx_intp, gathered = scratch
+        np.copyto(idx_intp, idx)
+        np.take(rows_by_glyph, idx_intp, axis=1, out=gathered, mode="clip")
+        # Text area as (char_h, rows, cols) glyph rows (a strided view of the
+        # canvas); a single strided copy places every glyph row
+        text = out[y0:y1, x0:x1].reshape(rows * char_h, cols * char_w * 3).view(glyph_row)
+        text.reshape(rows, char_h, cols).swapaxes(0, 1)[...] = gathered
+        return out
+
+    return blit
+
+def render_ascii_to_image_bgr(idx, atlas, bg=(0, 0, 0), padding=6, out=None, glyph_rows=None):
+    """Composite a (rows, cols) array of glyph indices into a BGR image.
+
+    The image size is fixed by the glyph size and the shape of `idx`, and
+    is rounded up to even dimensions (required by most encoders) so every
+    frame has the same size and the OpenCV VideoWriter won't fail.
+    Pass a canvas from `new_ascii_canvas` as `out` to reuse it across frames;
+    a new one is allocated if `out` is missing or has the wrong size.
+    Pass `atlas_glyph_rows(atlas)` as `glyph_rows` to avoid recomputing it
+    on every frame.
+    """
+    rows, cols = idx.shape
+    char_h, char_w = atlas.shape[1:3]
 
-    img = Image.new("RGB", (img_w, img_h), color=bg)
-    draw = ImageDraw.Draw(img)
-
-    y = padding
-    for line in lines:
-        draw.text((padding, y), line, font=font, fill=fg)
-        y += char_h
-
-    return img
+    img_w, img_h = ascii_image_size(rows, cols, atlas, padding)
+    if out is None or out.shape != (img_h, img_w, 3):
+        out = new_ascii_canvas(rows, cols, atlas, bg, padding)
+    if glyph_rows is None:
+        glyph_rows = atlas_glyph_rows(atlas)
+    return make_glyph_blitter(rows, cols, char_h, char_w, padding)(idx, glyph_rows, out)
 
 
 def merge_audio(video_path, audio_src, output_path):
@@ -106,60 +260,273 @@ def merge_audio(video_path, audio_src, output_path):
         # Return stderr for diagnostics
         return False, (e.stderr or str(e))
 
-def convert_video(input_path, output_path, cols, fps, font_size, save_mode, merge_audio_opt):
+def iter_ascii_frames(cap, atlas, cols=120, stride=1, workers=None, queue_size=8, max_frames=None):
+    """Yield rendered BGR ASCII frames from `cap` in order, using background threads.
+
+    A decode thread feeds BGR frames through a bounded queue to a pool of
+    render workers (the NumPy/OpenCV calls release the GIL), so decoding,
+    rendering and the caller's encoding overlap. Each yielded array is a
+    reused canvas and is only valid until the next frame is requested.
+    At most `max_frames` frames are produced when it is given.
+    """
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) - 2)
+    decoded = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def decode():
+        count = 0
+        try:
+            while not stop.is_set() and (max_frames is None or count < max_frames):
+                for _ in range(stride - 1):
+                    if not cap.grab():
+                        break
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                decoded.put(frame)
+                count += 1
+        finally:
+            decoded.put(None)
+
+    # One gray, index and canvas buffer per in-flight frame; slot i is reused
+    # only after the frame that last used it has been yielded.
+    n_slots = workers + 2
+    grays = [None] * n_slots
+    glyph_rows = atlas_glyph_rows(atlas)
+    canvases = [None] * n_slots
+    indices = [None] * n_slots
+
+    def render(frame, slot):
+        if grays[slot] is None:
+            grays[slot] = np.empty(frame.shape[:2], dtype=np.uint8)
+        small = resize_gray(frame, cols=cols, gray_buf=grays[slot])
+        idx = indices[slot] = gray_to_ascii_indices(small, out=indices[slot])
+        if canvases[slot] is None:
+            canvases[slot] = new_ascii_canvas(idx.shape[0], idx.shape[1], atlas)
+        return render_ascii_to_image_bgr(idx, atlas, out=canvases[slot], glyph_rows=glyph_rows)
+
+    reader = threading.Thread(target=decode, daemon=True)
+    reader.start()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            idx = 0
+            while True:
+                frame = decoded.get()
+                if frame is None:
+                    break
+                if len(pending) >= n_slots:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(render, frame, idx % n_slots))
+                idx += 1
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        # Unblock and stop the reader before the caller releases `cap`
+        stop.set()
+        while reader.is_alive():
+            try:
+                decoded.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        reader.join()
+
+# Hardware H.264 encoders to prefer over libx264, in order
+HW_ENCODERS = ("h264_nvenc", "h264_amf", "h264_qsv")
+
+# Bytes buffered on the ffmpeg stdin pipe before a write() syscall
+FFMPEG_PIPE_BUFFER = 1 << 20
+
+@functools.lru_cache(maxsize=None)
+def detect_encoder(ffmpeg_exe):
+    """Return the ffmpeg `-c:v` arguments for the fastest usable H.264 encoder.
+
+    A listed hardware encoder is only chosen if a one-frame test encode
+    succeeds (it may be compiled in without a matching GPU/driver).
+    """
+    try:
+        listing = subprocess.run([ffmpeg_exe, "-hide_banner", "-encoders"],
+                                 capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        listing = ""
+    for enc in HW_ENCODERS:
+        if f" {enc} " not in listing:
+            continue
+        probe = [ffmpeg_exe, "-hide_banner", "-loglevel", "error",
+                 "-f", "lavfi", "-i", "color=c=black:s=256x256", "-frames:v", "1",
+                 "-c:v", enc, "-f", "null", "-"]
+        try:
+            subprocess.run(probe, capture_output=True, check=True, timeout=15)
+            return ("-c:v", enc)
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return ("-c:v", "libx264", "-preset", "ultrafast")
+
+def ffmpeg_writer_open(output_path, w, h, fps, audio_src=None, codec_args=None):
+    """Start an ffmpeg process that encodes raw BGR frames written to its stdin.
+
+    When `audio_src` is given its first audio stream (if any) is muxed into
+    the output during the same encode, so no separate merge pass is needed.
+    `codec_args` overrides the encoder picked by `detect_encoder`.
+    Returns the Popen object, or None if FFmpeg is not on PATH.
+    """
+    ffmpeg_exe = shutil.which("ffmpeg")
+    if ffmpeg_exe is None:
+        return None
+
+    cmd = [
+        ffmpeg_exe, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "bgr24",
+        "-s", f"{w}x{h}", "-r", str(fps),
+        "-i", "-",
+    ]
+    if audio_src:
+        # "1:a:0?" keeps inputs without an audio stream from failing the encode
+        cmd += ["-i", audio_src, "-map", "0:v:0", "-map", "1:a:0?", "-c:a", "aac", "-shortest"]
+    cmd += [
+        *(codec_args or detect_encoder(ffmpeg_exe)),
+        "-pix_fmt", "yuv420p", output_path
+    ]
+    # stderr goes to a temp file so a chatty encoder can never block on a full pipe
+    errlog = tempfile.TemporaryFile()
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=errlog,
+                                bufsize=FFMPEG_PIPE_BUFFER)
+    except OSError:
+        errlog.close()
+        return None
+    if fcntl is not None and hasattr(fcntl, "F_SETPIPE_SZ"):
+        # Linux: grow the kernel pipe (64 KiB default) so a whole frame fits
+        # and Python and ffmpeg switch far less often
+        try:
+            fcntl.fcntl(proc.stdin.fileno(), fcntl.F_SETPIPE_SZ, FFMPEG_PIPE_BUFFER)
+        except OSError:
+            pass
+    proc.errlog = errlog
+    return proc
+
+def ffmpeg_writer_close(proc):
+    """Finish the encode started by `ffmpeg_writer_open`.
+
+    Returns (success: bool, message: str) with ffmpeg stderr as the message.
+    """
+    try:
+        proc.stdin.close()
+    except OSError:
+        pass
+    proc.wait()
+    proc.errlog.seek(0)
+    msg = proc.errlog.read().decode(errors="replace")
+    proc.errlog.close()
+    return proc.returncode == 0, msg
+
+def print_message(title, message):
+    """Default `on_info`/`on_error` callback: report to the console."""
+    print(f"{title}: {message}")
+
+def convert_video(input_path, output_path, cols, fps, font_size, save_mode, merge_audio_opt,
+                  on_error=print_message, on_info=print_message):
+    """Play `input_path` as ASCII in the terminal or save it as an ASCII video.
+
+    Results and failures are reported through `on_info(title, message)` and
+    `on_error(title, message)`; the GUI passes tkinter message boxes.
+    """
     cap = cv2.VideoCapture(input_path)
     if not cap.isOpened():
-        messagebox.showerror("Error", f"Cannot open {input_path}")
+        on_error("Error", f"Cannot open {input_path}")
         return
+    try:
+        # Hold as few decoded frames as possible; not every backend honors this
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    except Exception:
+        pass
 
     in_fps = cap.get(cv2.CAP_PROP_FPS)
     fps = fps if fps > 0 else (in_fps if in_fps > 0 else 24.0)
+    # Source frames per output frame; the extra ones are grabbed without decoding
+    stride = max(1, round(in_fps / fps)) if in_fps > 0 else 1
+    if in_fps > 0:
+        # Keeping every stride-th frame only preserves the duration (and audio
+        # sync) when the output runs at exactly in_fps / stride
+        fps = in_fps / stride
     frame_delay = 1.0 / fps
     last_time = time.time()
+    skip = 0
 
-    # Font setup
-    font_path = None
-    candidates = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
-        "C:\\Windows\\Fonts\\consola.ttf",
-        "C:\\Windows\\Fonts\\lucon.ttf"
-    ]
-    for p in candidates:
-        if os.path.exists(p):
-            font_path = p
-            break
-    font = ImageFont.truetype(font_path, font_size) if font_path else ImageFont.load_default()
+    atlas = load_glyph_atlas(find_font_path(), font_size) if save_mode else None
 
-    # For saving
+    # For saving; the letterbox canvas is allocated once and reused
     writer = None
+    ffmpeg_proc = None
+    audio_muxed = False
+    frames = None
+    pad_canvas = None
+    pad_rect = None
     if save_mode:
         fourcc = cv2.VideoWriter_fourcc(*"mp4v")
 
     try:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            lines = frame_to_ascii_lines(gray, cols=cols)
-
-            if not save_mode:
-                os.system('cls' if os.name == 'nt' else 'clear')
-                print("\n".join(lines))
+        if not save_mode:
+            if os.name == 'nt':
+                os.system('')  # enables ANSI escape handling in the Windows console
+            # Clear once; each frame then just homes the cursor and redraws.
+            # Frames go out as one bytes write when stdout has a binary buffer.
+            term_out = getattr(sys.stdout, "buffer", None)
+            gray_buf = None
+            # One bytearray holds cursor-home + rows + erase and every frame
+            # is written into it in place; it is only rebuilt on a size change
+            frame_buf = None
+            frame_rows = None
+            sys.stdout.write("\x1b[2J")
+            sys.stdout.flush()
+            while True:
+                for _ in range(stride - 1 + skip):
+                    if not cap.grab():
+                        break
+                skip = 0
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                if gray_buf is None or gray_buf.shape != frame.shape[:2]:
+                    gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+                small = resize_gray(frame, cols=cols, gray_buf=gray_buf)
+                if frame_buf is None or frame_rows.shape != (small.shape[0], cols + 1):
+                    # First frame, or the stream changed resolution mid-way
+                    rows = small.shape[0]
+                    frame_buf = bytearray(b"\x1b[H" + bytes(rows * (cols + 1)) + b"\x1b[J")
+                    frame_rows = np.frombuffer(frame_buf, dtype=np.uint8)[3:-3].reshape(rows, cols + 1)
+                ascii_rows_into(small, frame_rows)
+                if term_out is not None:
+                    term_out.write(frame_buf)
+                    term_out.flush()
+                else:
+                    sys.stdout.write(frame_buf.decode("ascii"))
+                    sys.stdout.flush()
                 elapsed = time.time() - last_time
                 sleep_for = frame_delay - elapsed
                 if sleep_for > 0:
                     time.sleep(sleep_for)
+                else:
+                    # Fell behind: drop whole output frames to catch up
+                    skip = int(-sleep_for / frame_delay) * stride
                 last_time = time.time()
-            else:
-                img = render_ascii_to_image(lines, font)
-                img_bgr = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
+        else:
+            # Decode and render run on background threads; this loop is the
+            # single writer and receives frames in their original order.
+            frames = iter_ascii_frames(cap, atlas, cols=cols, stride=stride)
+            for img_bgr in frames:
                 img_h, img_w = img_bgr.shape[:2]
 
-                # Initialize writer on first frame using its (width,height)
-                if writer is None:
+                # Initialize writer on first frame using its (width,height).
+                # Prefer piping raw frames to ffmpeg; fall back to OpenCV.
+                if writer is None and ffmpeg_proc is None:
                     out_w, out_h = img_w, img_h
+                    ffmpeg_proc = ffmpeg_writer_open(output_path, out_w, out_h, fps,
+                                                     audio_src=input_path if merge_audio_opt else None)
+                    audio_muxed = ffmpeg_proc is not None and merge_audio_opt
+                if writer is None and ffmpeg_proc is None:
                     writer = cv2.VideoWriter(output_path, fourcc, fps, (out_w, out_h))
                     if not writer.isOpened():
                         # Try alternative codec/container fallback (.avi with MJPG)
@@ -174,15 +541,8 @@ def convert_video(input_path, output_path, cols, fps, font_size, save_mode, merg
                             output_path = alt_path
                         else:
                             # If still not opened, show error and abort saving
-                            messagebox.showerror("Error", "Failed to open video writer with available codecs.")
-                            cap.release()
+                            on_error("Error", "Failed to open video writer with available codecs.")
                             return
-                else:
-                    # Use previously determined output size
-                    out_w = int(writer.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
-                    out_h = int(writer.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
-                    if out_w <= 0 or out_h <= 0:
-                        out_w, out_h = img_w, img_h
 
                 # If current frame differs from the writer canvas, scale down (preserve aspect)
                 # and center the frame with black padding instead of stretching.
@@ -198,43 +558,173 @@ def convert_video(input_path, output_path, cols, fps, font_size, save_mode, merg
                     else:
                         frame_resized = img_bgr
 
-                    canvas = np.zeros((out_h, out_w, 3), dtype=img_bgr.dtype)
+                    if pad_canvas is None:
+                        pad_canvas = np.zeros((out_h, out_w, 3), dtype=img_bgr.dtype)
                     x = (out_w - new_w) // 2
                     y = (out_h - new_h) // 2
-                    canvas[y:y+new_h, x:x+new_w] = frame_resized
-                    to_write = canvas
+                    # Only re-zero the scratch canvas when the letterbox changes
+                    if pad_rect is not None and pad_rect != (x, y, new_w, new_h):
+                        pad_canvas.fill(0)
+                    pad_rect = (x, y, new_w, new_h)
+                    pad_canvas[y:y+new_h, x:x+new_w] = frame_resized
+                    to_write = pad_canvas
                 else:
                     to_write = img_bgr
 
-                try:
-                    writer.write(to_write)
-                except Exception:
-                    print("⚠️ Failed to write a frame to the video writer.")
+                if ffmpeg_proc is not None:
+                    try:
+                        ffmpeg_proc.stdin.write(to_write.data)
+                    except OSError:
+                        # ffmpeg exited early; its stderr is reported on close
+                        break
+                else:
+                    try:
+                        writer.write(to_write)
+                    except Exception:
+                        print("⚠️ Failed to write a frame to the video writer.")
 
+        if frames is not None:
+            frames.close()
         if writer:
             writer.release()
+        if ffmpeg_proc is not None:
+            success, msg = ffmpeg_writer_close(ffmpeg_proc)
+            ffmpeg_proc = None
+            if not success:
+                on_error("Error", f"FFmpeg failed to encode the video.\n{msg}")
+                return
         cap.release()
 
         if save_mode:
-            messagebox.showinfo("Done", f"ASCII video saved to:\n{output_path}")
-            if merge_audio_opt:
+            on_info("Done", f"ASCII video saved to:\n{output_path}")
+            # The ffmpeg writer muxes audio while encoding; only the OpenCV
+            # fallback needs the separate merge pass
+            if merge_audio_opt and not audio_muxed:
                 out_with_audio = os.path.splitext(output_path)[0] + "_with_audio.mp4"
                 success, msg = merge_audio(output_path, input_path, out_with_audio)
                 if success:
-                    messagebox.showinfo("Audio Merge", f"✅ Audio merged:\n{out_with_audio}")
+                    on_info("Audio Merge", f"✅ Audio merged:\n{out_with_audio}")
                 else:
                     # Show the diagnostic message from ffmpeg when available
-                    messagebox.showwarning("Audio Merge", f"⚠️ Failed to merge audio.\n{msg}")
+                    on_error("Audio Merge", f"⚠️ Failed to merge audio.\n{msg}")
 
     except KeyboardInterrupt:
         print("\nStopped by user.")
     finally:
+        if frames is not None:
+            frames.close()
         if writer:
             writer.release()
+        if ffmpeg_proc is not None:
+            ffmpeg_writer_close(ffmpeg_proc)
         cap.release()
 
+# Encoder for chunk processes: hardware encoders cap concurrent sessions
+CHUNK_ENCODER = ("-c:v", "libx264", "-preset", "ultrafast")
+
+def _convert_chunk(input_path, chunk_path, start, n_frames, cols, fps, font_size, stride):
+    """Render `n_frames` output frames starting at source frame `start` into `chunk_path`.
+
+    Runs in a worker process; returns (success: bool, message: str).
+    """
+    # The pool already uses one process per core
+    cv2.setNumThreads(1)
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        return False, f"Cannot open {input_path}"
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    atlas = load_glyph_atlas(find_font_path(), font_size)
+
+    proc = None
+    frames = iter_ascii_frames(cap, atlas, cols=cols, stride=stride, workers=1, max_frames=n_frames)
+    try:
+        for img_bgr in frames:
+            if proc is None:
+                img_h, img_w = img_bgr.shape[:2]
+                proc = ffmpeg_writer_open(chunk_path, img_w, img_h, fps, codec_args=CHUNK_ENCODER)
+                if proc is None:
+                    return False, "FFmpeg not found in PATH."
+            try:
+                proc.stdin.write(img_bgr.data)
+            except OSError:
+                break
+    finally:
+        frames.close()
+        cap.release()
+        if proc is not None:
+            success, msg = ffmpeg_writer_close(proc)
+    if proc is None:
+        return False, "No frames decoded."
+    return success, msg
+
+def convert_video_parallel(input_path, output_path, cols, fps, font_size, merge_audio_opt, n_workers=None,
+                           on_error=print_message, on_info=print_message):
+    """Save an ASCII video by encoding time chunks in separate processes.
+
+    The frame range is split into one chunk per worker; each worker seeks
+    with CAP_PROP_POS_FRAMES, encodes its chunk to a temporary file, and the
+    chunks are joined with ffmpeg's concat demuxer (muxing the original
+    audio in the same step). Falls back to `convert_video` when FFmpeg is
+    missing or the frame count is unknown.
+    """
+    ffmpeg_exe = shutil.which("ffmpeg")
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        on_error("Error", f"Cannot open {input_path}")
+        return
+    in_fps = cap.get(cv2.CAP_PROP_FPS)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    cap.release()
+    if ffmpeg_exe is None or total <= 0:
+        return convert_video(input_path, output_path, cols, fps, font_size, True, merge_audio_opt,
+                             on_error=on_error, on_info=on_info)
+
+    fps = fps if fps > 0 else (in_fps if in_fps > 0 else 24.0)
+    stride = max(1, round(in_fps / fps)) if in_fps > 0 else 1
+    if in_fps > 0:
+        # Same as convert_video: encode at the rate of the frames actually kept
+        fps = in_fps / stride
+    if n_workers is None:
+        n_workers = max(1, (os.cpu_count() or 1) // 2)
+    # Split whole output frames so every chunk starts on a kept source frame
+    n_out = -(-total // stride)
+    n_workers = max(1, min(n_workers, n_out))
+    bounds = [i * n_out // n_workers for i in range(n_workers + 1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chunk_paths = [os.path.join(tmp, f"chunk_{i:03d}.mp4") for i in range(n_workers)]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(_convert_chunk, input_path, chunk_paths[i], bounds[i] * stride,
+                            bounds[i + 1] - bounds[i], cols, fps, font_size, stride)
+                for i in range(n_workers)
+            ]
+            results = [f.result() for f in futures]
+        for success, msg in results:
+            if not success:
+                on_error("Error", f"Failed to encode a chunk.\n{msg}")
+                return
+
+        list_path = os.path.join(tmp, "list.txt")
+        with open(list_path, "w") as f:
+            for path in chunk_paths:
+                f.write(f"file '{path}'\n")
+        cmd = [ffmpeg_exe, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+        if merge_audio_opt:
+            cmd += ["-i", input_path, "-map", "0:v:0", "-map", "1:a:0?", "-c:a", "aac", "-shortest"]
+        cmd += ["-c:v", "copy", output_path]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            on_error("Error", f"Failed to join the encoded chunks.\n{e.stderr or e}")
+            return
+
+    on_info("Done", f"ASCII video saved to:\n{output_path}")
+
 # --- GUI ---
 def start_conversion():
+    from tkinter import messagebox
+
     video = entry_video.get()
     if not os.path.exists(video):
         messagebox.showerror("Error", "Select a valid video file.")
@@ -246,62 +736,101 @@ def start_conversion():
     save_mode = var_mode.get() == "save"
     merge_audio_opt = var_audio.get()
 
-    threading.Thread(target=convert_video, args=(video, output, cols, fps, font_size, save_mode, merge_audio_opt), daemon=True).start()
+    threading.Thread(target=convert_video, args=(video, output, cols, fps, font_size, save_mode, merge_audio_opt),
+                     kwargs={"on_error": messagebox.showerror, "on_info": messagebox.showinfo}, daemon=True).start()
 
 def browse_video():
+    import tkinter as tk
+    from tkinter import filedialog
+
     path = filedialog.askopenfilename(filetypes=[("Video files", "*.mp4 *.mov *.avi")])
     if path:
         entry_video.delete(0, tk.END)
         entry_video.insert(0, path)
 
 def browse_output():
+    import tkinter as tk
+    from tkinter import filedialog
+
     path = filedialog.asksaveasfilename(defaultextension=".mp4", filetypes=[("MP4 files", "*.mp4")])
     if path:
         entry_output.delete(0, tk.END)
         entry_output.insert(0, path)
 
-root = tk.Tk()
-root.title("🎞 ASCII Video Converter")
-root.geometry("480x420")
-root.resizable(False, False)
-
-tk.Label(root, text="Video File:").pack(anchor="w", padx=10, pady=4)
-frame_video = tk.Frame(root)
-frame_video.pack(fill="x", padx=10)
-entry_video = tk.Entry(frame_video)
-entry_video.pack(side="left", fill="x", expand=True)
-tk.Button(frame_video, text="Browse", command=browse_video).pack(side="right")
-
-tk.Label(root, text="Output File:").pack(anchor="w", padx=10, pady=4)
-frame_out = tk.Frame(root)
-frame_out.pack(fill="x", padx=10)
-entry_output = tk.Entry(frame_out)
-entry_output.pack(side="left", fill="x", expand=True)
-tk.Button(frame_out, text="Browse", command=browse_output).pack(side="right")
-
-tk.Label(root, text="Columns (Width):").pack(anchor="w", padx=10, pady=2)
-entry_cols = tk.Entry(root)
-entry_cols.insert(0, "120")
-entry_cols.pack(fill="x", padx=10)
-
-tk.Label(root, text="FPS (0 = auto):").pack(anchor="w", padx=10, pady=2)
-entry_fps = tk.Entry(root)
-entry_fps.insert(0, "0")
-entry_fps.pack(fill="x", padx=10)
-
-tk.Label(root, text="Font Size (for save mode):").pack(anchor="w", padx=10, pady=2)
-entry_font = tk.Entry(root)
-entry_font.insert(0, "12")
-entry_font.pack(fill="x", padx=10)
-
-var_mode = tk.StringVar(value="terminal")
-tk.Label(root, text="Mode:").pack(anchor="w", padx=10, pady=4)
-tk.Radiobutton(root, text="Play in Terminal", variable=var_mode, value="terminal").pack(anchor="w", padx=20)
-tk.Radiobutton(root, text="Save as MP4", variable=var_mode, value="save").pack(anchor="w", padx=20)
-
-var_audio = tk.BooleanVar(value=True)
-tk.Checkbutton(root, text="Merge Original Audio (FFmpeg)", variable=var_audio).pack(anchor="w", padx=20, pady=6)
-
-tk.Button(root, text="▶ Start", bg="#4CAF50", fg="white", font=("Arial", 12, "bold"), command=start_conversion).pack(pady=10)
-
-root.mainloop()
+def run_gui():
+    # tkinter is imported here so CLI runs never pay for it
+    import tkinter as tk
+
+    global entry_video, entry_output, entry_cols, entry_fps, entry_font, var_mode, var_audio
+
+    root = tk.Tk()
+    root.title("🎞 ASCII Video Converter")
+    root.geometry("480x420")
+    root.resizable(False, False)
+
+    tk.Label(root, text="Video File:").pack(anchor="w", padx=10, pady=4)
+    frame_video = tk.Frame(root)
+    frame_video.pack(fill="x", padx=10)
+    entry_video = tk.Entry(frame_video)
+    entry_video.pack(side="left", fill="x", expand=True)
+    tk.Button(frame_video, text="Browse", command=browse_video).pack(side="right")
+
+    tk.Label(root, text="Output File:").pack(anchor="w", padx=10, pady=4)
+    frame_out = tk.Frame(root)
+    frame_out.pack(fill="x", padx=10)
+    entry_output = tk.Entry(frame_out)
+    entry_output.pack(side="left", fill="x", expand=True)
+    tk.Button(frame_out, text="Browse", command=browse_output).pack(side="right")
+
+    tk.Label(root, text="Columns (Width):").pack(anchor="w", padx=10, pady=2)
+    entry_cols = tk.Entry(root)
+    entry_cols.insert(0, "120")
+    entry_cols.pack(fill="x", padx=10)
+
+    tk.Label(root, text="FPS (0 = auto):").pack(anchor="w", padx=10, pady=2)
+    entry_fps = tk.Entry(root)
+    entry_fps.insert(0, "0")
+    entry_fps.pack(fill="x", padx=10)
+
+    tk.Label(root, text="Font Size (for save mode):").pack(anchor="w", padx=10, pady=2)
+    entry_font = tk.Entry(root)
+    entry_font.insert(0, "12")
+    entry_font.pack(fill="x", padx=10)
+
+    var_mode = tk.StringVar(value="terminal")
+    tk.Label(root, text="Mode:").pack(anchor="w", padx=10, pady=4)
+    tk.Radiobutton(root, text="Play in Terminal", variable=var_mode, value="terminal").pack(anchor="w", padx=20)
+    tk.Radiobutton(root, text="Save as MP4", variable=var_mode, value="save").pack(anchor="w", padx=20)
+
+    var_audio = tk.BooleanVar(value=True)
+    tk.Checkbutton(root, text="Merge Original Audio (FFmpeg)", variable=var_audio).pack(anchor="w", padx=20, pady=6)
+
+    tk.Button(root, text="▶ Start", bg="#4CAF50", fg="white", font=("Arial", 12, "bold"), command=start_conversion).pack(pady=10)
+
+    root.mainloop()
+
+# --- CLI ---
+def main():
+    parser = argparse.ArgumentParser(description="Convert a video into ASCII art. Opens the GUI when no input is given.")
+    parser.add_argument("input", nargs="?", help="input video file")
+    parser.add_argument("-o", "--output", default="ascii_out.mp4", help="output video file (default: ascii_out.mp4)")
+    parser.add_argument("--cols", type=int, default=120, help="ASCII columns (default: 120)")
+    parser.add_argument("--fps", type=float, default=0, help="output fps, 0 = source fps")
+    parser.add_argument("--font-size", type=int, default=12, help="font size for saved video (default: 12)")
+    parser.add_argument("--terminal", action="store_true", help="play in the terminal instead of saving")
+    parser.add_argument("--no-audio", action="store_true", help="do not merge the original audio")
+    parser.add_argument("--parallel", action="store_true", help="encode time chunks in separate processes")
+    parser.add_argument("--workers", type=int, default=None, help="processes for --parallel (default: half the CPUs)")
+    args = parser.parse_args()
+
+    if args.input is None:
+        run_gui()
+    elif args.parallel and not args.terminal:
+        convert_video_parallel(args.input, args.output, args.cols, args.fps, args.font_size,
+                               not args.no_audio, n_workers=args.workers)
+    else:
+        convert_video(args.input, args.output, args.cols, args.fps, args.font_size,
+                      not args.terminal, not args.no_audio)
+
+if __name__ == "__main__":
+    main()